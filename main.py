@@ -1,14 +1,35 @@
 """
 This module provides functions for managing Docker services.
 """
+# pylint: disable=too-many-lines
 
+import atexit
+import http.client
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote, urlencode
 
 try:
     import docker
+    import requests
 except ImportError as e:
     logging.error("Failed to import docker library: %s", e)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from flask import Flask
 except ImportError as e:
@@ -28,29 +49,653 @@ if __name__ == '__main__':
 # Set up logger to write logs to stdout
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# Only add the handler once, so a re-imported module does not write every record twice
+if not logger.handlers:
+    # Create a stream handler and set its log level to INFO
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setLevel(logging.INFO)
+
+    # Create a formatter and set it as the stream handler's formatter
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    stream_handler.setFormatter(formatter)
+
+    # Queue records on the logger and let a background listener write them, so
+    # logging does not block the autoscaler on stdout. The QueueHandler still
+    # formats each message in the calling thread, while its arguments are current.
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(log_queue, stream_handler,
+                                                  respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+# Default Docker socket and the size of the connection pool kept open to it
+DEFAULT_DOCKER_SOCKET = 'unix://var/run/docker.sock'
+DOCKER_MAX_POOL_SIZE = 32
+
+# Labels that control autoscaling of a service, interned so that label lookups
+# can match keys by identity
+_LBL_ON = sys.intern('swarm.autoscaler')
+_LBL_MAX = sys.intern('swarm.autoscaler.maximum')
+_DIGITS = frozenset('0123456789')
+
+# Seconds for which service labels are served from the cache, and for which
+# a service found not to be autoscalable is remembered as such
+LABEL_CACHE_TTL = 10
+NOT_AUTOSCALABLE_CACHE_TTL = 300
+
+# While the Docker event stream is watched, changes invalidate the cache as they
+# happen and the TTL is only a safety net. Seconds to wait before reconnecting,
+# doubled after every attempt that fails or drops quickly, up to the maximum.
+EVENT_CACHE_TTL = 300
+EVENT_RETRY_DELAY = 5
+EVENT_RETRY_MAX_DELAY = 300
+
+_client = None  # pylint: disable=invalid-name
+_update_executor = None  # pylint: disable=invalid-name
+_docker_socket = None  # pylint: disable=invalid-name
+_docker_socket_resolved = False  # pylint: disable=invalid-name
+_client_lock = threading.Lock()
+
+# Labels are cached by service ID together with the service name. Names are
+# resolved to IDs from earlier lookups for as long as either cache holds the ID.
+_label_cache = {}
+_not_autoscalable = {}
+_service_ids = {}
+_label_cache_lock = threading.Lock()
+# Bumped whenever cached labels are dropped, so a lookup that started before
+# does not store what it read afterwards
+_label_cache_epoch = 0  # pylint: disable=invalid-name
+
+_event_thread = None  # pylint: disable=invalid-name
+_events_connected = threading.Event()
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads  # pylint: disable=no-member
+
+_docker_result = docker.api.client.APIClient._result  # pylint: disable=protected-access
+
+
+def _orjson_result(self, response, json=False, binary=False):  # pylint: disable=redefined-outer-name
+    """
+    Decodes JSON responses of the Docker API with orjson instead of the stdlib json module.
+    """
+    if json:
+        self._raise_for_status(response)  # pylint: disable=protected-access
+        return _json_loads(response.content)
+    return _docker_result(self, response, json=json, binary=binary)
+
+
+def get_client():
+    """
+    Returns the shared Docker client, creating it on first use.
+
+    Nothing talks to the Docker socket until the first call, so importing the
+    module (for the healthcheck or in tests) never probes the daemon. The
+    socket is read from the DOCKERSOCKET environment variable at that point.
+    The client keeps a pool of keep-alive connections to the Docker socket,
+    so every call reuses an open connection instead of reconnecting.
+
+    Returns:
+        docker.DockerClient: The shared Docker client.
+    """
+    global _client  # pylint: disable=global-statement
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if orjson is not None:
+                    docker.api.client.APIClient._result = _orjson_result  # pylint: disable=protected-access
+                docker_socket = os.getenv('DOCKERSOCKET', DEFAULT_DOCKER_SOCKET)
+                _client = docker.DockerClient(
+                    base_url=docker_socket or None,
+                    max_pool_size=DOCKER_MAX_POOL_SIZE,
+                )
+    return _client
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix domain socket.
+    """
+
+    def __init__(self, socket_path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerSocket:
+    """
+    Minimal Docker Engine API client that talks HTTP/1.1 directly over the Docker Unix socket.
+
+    It only covers the endpoints the autoscaler needs and returns the decoded
+    JSON as plain dicts, skipping the requests/urllib3 layers and the model
+    objects of the docker library. Each thread keeps its own keep-alive
+    connection to the socket, until close() is called.
+
+    Args:
+        socket_path (str): The path of the Docker Unix socket.
+        timeout (int): The socket timeout in seconds.
+    """
+
+    def __init__(self, socket_path, timeout=60):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        # The open connections of all threads, so close() can reach them
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        self._auth_configs = None
+
+    def close(self):
+        """
+        Closes the connections of all threads. Later requests open new ones.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, set()
+        for connection in connections:
+            connection.close()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        with self._connections_lock:
+            if connection is None or connection not in self._connections:
+                connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+                self._connections.add(connection)
+                self._local.connection = connection
+        return connection
+
+    def _send(self, method, url, body, headers, retry=True):
+        connection = self._connection()
+        sent = False
+        try:
+            connection.request(method, url, body=body, headers=headers)
+            sent = True
+            response = connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException) as ex:
+            connection.close()
+            self._local.connection = None
+            with self._connections_lock:
+                self._connections.discard(connection)
+            # The daemon may have closed the idle keep-alive connection, so retry
+            # once on a new one. Only GETs are retried once the request was sent,
+            # since an update may already have been applied.
+            if (not retry or not isinstance(ex, (ConnectionError, http.client.HTTPException))
+                    or (sent and method != 'GET')):
+                raise
+        return self._send(method, url, body, headers, retry=False)
+
+    def _request(self, method, url, data=None, headers=None):
+        headers = dict(headers or {})
+        body = None
+        if data is not None:
+            body = orjson.dumps(data) if orjson is not None else json.dumps(data).encode()  # pylint: disable=no-member
+            headers['Content-Type'] = 'application/json'
+        status, content = self._send(method, url, body, headers)
+
+        if status >= 400:
+            # Error bodies are usually JSON, but proxies and plugins may return plain text
+            try:
+                explanation = _json_loads(content).get('message')
+            except (ValueError, AttributeError):
+                explanation = content.decode(errors='replace').strip() or None
+            # Attach a response like the docker library does, for status_code and str()
+            response = requests.Response()
+            response.status_code = status
+            response.reason = http.client.responses.get(status, '')
+            response.url = url
+            response._content = content  # pylint: disable=protected-access
+            message = f'{status} Error for {method} {url}'
+            error = docker.errors.NotFound if status == 404 else docker.errors.APIError
+            raise error(message, response=response, explanation=explanation)
+        return _json_loads(content) if content else None
+
+    def _registry_auth_header(self, image):
+        if self._auth_configs is None:
+            self._auth_configs = docker.auth.load_config()
+        registry, _ = docker.auth.resolve_repository_name(image)
+        auth_config = docker.auth.resolve_authconfig(self._auth_configs, registry)
+        return docker.auth.encode_header(auth_config) if auth_config else None
+
+    def list_services(self, filters=None):
+        """
+        Lists services, optionally filtered by the daemon.
+
+        Args:
+            filters (dict): Filters to apply, for example {'label': ['swarm.autoscaler=true']}.
+
+        Returns:
+            list: The services as returned by the Docker API.
+        """
+        url = '/services'
+        if filters:
+            url += '?' + urlencode({'filters': json.dumps(filters)})
+        return self._request('GET', url)
+
+    def inspect_service(self, service_id):
+        """
+        Returns the inspect data of a service by ID or name.
+        """
+        return self._request('GET', '/services/' + quote(service_id, safe=''))
+
+    def update_service(self, service_id, version, spec):
+        """
+        Replaces the spec of a service.
+
+        Args:
+            service_id (str): The ID of the service.
+            version (int): The version of the service being updated, to avoid conflicting writes.
+            spec (dict): The complete new service spec.
+
+        Returns:
+            dict: The response of the Docker API, with a "Warnings" key.
+        """
+        headers = {}
+        image = spec.get('TaskTemplate', {}).get('ContainerSpec', {}).get('Image')
+        if image:
+            # Only send registry credentials if there are any for the image's registry
+            auth_header = self._registry_auth_header(image)
+            if auth_header:
+                headers['X-Registry-Auth'] = auth_header
+        url = f"/services/{quote(service_id, safe='')}/update?{urlencode({'version': version})}"
+        return self._request('POST', url, data=spec, headers=headers)
+
+
+def get_docker_socket():
+    """
+    Returns the shared DockerSocket client, creating it on first use.
+
+    Returns:
+        DockerSocket: The shared client, or None if DOCKERSOCKET does not point
+        to a Unix socket, in which case the docker library client is used.
+    """
+    global _docker_socket, _docker_socket_resolved  # pylint: disable=global-statement
+    if not _docker_socket_resolved:
+        with _client_lock:
+            if not _docker_socket_resolved:
+                base_url = docker.utils.parse_host(os.getenv('DOCKERSOCKET', DEFAULT_DOCKER_SOCKET))
+                if base_url.startswith('http+unix://'):
+                    socket_path = base_url[len('http+unix://'):]
+                    if not socket_path.startswith('/'):
+                        socket_path = '/' + socket_path
+                    _docker_socket = DockerSocket(socket_path)
+                _docker_socket_resolved = True
+    return _docker_socket
+
+
+def _get_update_executor():
+    """
+    Returns the shared thread pool that runs service updates, creating it on first use.
+
+    The pool lives for the whole process, so its threads, and the Docker
+    socket connection each of them keeps, are reused from tick to tick.
+    """
+    global _update_executor  # pylint: disable=global-statement
+    if _update_executor is None:
+        with _client_lock:
+            if _update_executor is None:
+                _update_executor = ThreadPoolExecutor(max_workers=DOCKER_MAX_POOL_SIZE,
+                                                      thread_name_prefix='docker-update')
+    return _update_executor
+
+
+def _inspect_service(service):
+    """
+    Inspects a service by name or ID, without inserting defaults.
+    """
+    docker_socket = get_docker_socket()
+    if docker_socket is not None:
+        return docker_socket.inspect_service(service)
+    return get_client().api.inspect_service(service, insert_defaults=False)
+
+
+def _get_service_attrs(service):
+    """
+    Returns the raw inspect data of a service.
+
+    Args:
+        service (str, dict or docker.models.services.Service): The name or ID of
+            the Docker service, its inspect data, or an already-fetched service object.
+
+    Returns:
+        dict: The service as returned by the Docker API. Names and IDs are
+        inspected without inserting defaults and without building a Service
+        object, since only the Spec is read. Names that were seen before are
+        inspected by their ID, which the daemon resolves without a name lookup.
+    """
+    if isinstance(service, str):
+        with _label_cache_lock:
+            service_id, _ = _service_ids.get(service, (None, None))
+        if service_id is not None:
+            try:
+                attrs = _inspect_service(service_id)
+                # The name may have moved to another service since it was resolved
+                if attrs['Spec']['Name'] == service:
+                    return attrs
+            except docker.errors.NotFound:
+                pass
+            with _label_cache_lock:
+                _service_ids.pop(service, None)
+        attrs = _inspect_service(service)
+        with _label_cache_lock:
+            expires = time.monotonic() + _label_cache_ttl()
+            _service_ids[attrs['Spec']['Name']] = (attrs['ID'], expires)
+        return attrs
+    if isinstance(service, dict):
+        return service
+    return service.attrs
+
+
+def _parse_small_uint(value):
+    """
+    Parses a short string of ASCII decimal digits, such as a replica count label.
+
+    Returns:
+        int: The parsed number, or None if the string contains anything but the digits 0-9.
+    """
+    number = 0
+    for char in value:
+        if char not in _DIGITS:
+            return None
+        number = number * 10 + (ord(char) - 48)
+    return number
+
+
+@dataclass(frozen=True)
+class AutoscaleSpec:
+    """
+    The autoscaling settings of a service, parsed from its labels.
+
+    Attributes:
+        enabled (bool): Whether the service may be autoscaled.
+        max_replicas (int): The maximum allowed replicas, or None if there is no maximum.
+    """
+    __slots__ = ('enabled', 'max_replicas')
+
+    enabled: bool
+    max_replicas: Optional[int]
+
+
+def parse_spec(labels):
+    """
+    Parses the autoscaler labels of a service once, so cache hits skip the parsing.
+
+    Args:
+        labels (dict): The labels of the service.
+
+    Returns:
+        AutoscaleSpec: The autoscaling settings of the service. An invalid
+        maximum is logged and disables autoscaling.
+    """
+    if labels.get(_LBL_ON) != 'true':
+        return AutoscaleSpec(False, None)
+
+    # Check if the maximum allowed replicas label is set
+    max_replicas_label = labels.get(_LBL_MAX)
+    if not max_replicas_label:
+        return AutoscaleSpec(True, None)
+
+    # Check if the maximum allowed replicas is a non-negative integer
+    max_replicas = _parse_small_uint(max_replicas_label)
+    if max_replicas is None:
+        logger.error("Error: Invalid value for 'swarm.autoscaler.maximum' label: %s",
+                     max_replicas_label)
+        return AutoscaleSpec(False, None)
+    return AutoscaleSpec(True, max_replicas)
+
+
+def _resolve_service_id(service, now):
+    """
+    Resolves a service name to the ID it was last seen with, or returns a service ID as is.
+
+    Must be called with _label_cache_lock held. A name is only trusted for as
+    long as the labels or the not-autoscalable result of its service are
+    cached. A service removed and created again under the same name is caught
+    by the remove event, or by the name check once the name moves to another ID.
+
+    Returns:
+        tuple: The service ID and the name it was resolved from, or None for an ID.
+    """
+    entry = _service_ids.get(service)
+    if entry is None:
+        return service, None
+    service_id, expires = entry
+    if expires < now:
+        del _service_ids[service]
+        return service, None
+    return service_id, service
+
+
+def _cached_labels(service):
+    """
+    Returns the cached (labels, autoscaling settings) of a service name or ID, or None
+    if they are missing or expired.
+    """
+    now = time.monotonic()
+    with _label_cache_lock:
+        service_id, name = _resolve_service_id(service, now)
+        entry = _label_cache.get(service_id)
+        if entry is None:
+            return None
+        expires, service_name, labels, autoscale = entry
+        if expires < now:
+            del _label_cache[service_id]
+            return None
+        # The service was renamed since the name was resolved
+        if name is not None and name != service_name:
+            del _service_ids[name]
+            return None
+        return labels, autoscale
+
+
+def _cache_labels(attrs, epoch):
+    """
+    Parses the labels from the inspect data of a service and caches them by service ID.
 
-# Create a stream handler and set its log level to INFO
-stream_handler = logging.StreamHandler(sys.stdout)
-stream_handler.setLevel(logging.INFO)
+    Args:
+        attrs (dict): The inspect data of the service.
+        epoch (int): The value of _label_cache_epoch before the service was
+            read. If an event dropped cached labels since, the data may predate
+            the change and is not cached.
+
+    Returns:
+        tuple: The labels and the autoscaling settings of the service.
+    """
+    spec = attrs['Spec']
+    labels = spec['Labels']
+    autoscale = parse_spec(labels)
+
+    now = time.monotonic()
+    with _label_cache_lock:
+        if epoch != _label_cache_epoch:
+            return labels, autoscale
+        # The TTL is read under the lock, so it cannot outlive a lost event stream
+        expires = now + _label_cache_ttl()
+        _label_cache[attrs['ID']] = (expires, spec['Name'], labels, autoscale)
+        if autoscale.enabled:
+            _not_autoscalable.pop(attrs['ID'], None)
+        else:
+            # Keep the name resolving for as long as the result is remembered,
+            # so lookups by name skip the inspect too
+            expires = max(expires, now + NOT_AUTOSCALABLE_CACHE_TTL)
+            _not_autoscalable[attrs['ID']] = (expires, spec['Name'])
+        _service_ids[spec['Name']] = (attrs['ID'], expires)
+    return labels, autoscale
 
-# Create a formatter and set it as the stream handler's formatter
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-stream_handler.setFormatter(formatter)
 
-# Add the stream handler to the logger
-logger.addHandler(stream_handler)
+def _label_cache_ttl():
+    """
+    Returns how long labels are cached for, which is longer while service events are watched.
+    """
+    return EVENT_CACHE_TTL if _events_connected.is_set() else LABEL_CACHE_TTL
+
+
+def _known_not_autoscalable(service):
+    """
+    Checks if a service name or ID was recently found not to be autoscalable.
+
+    The result is remembered for NOT_AUTOSCALABLE_CACHE_TTL seconds, for
+    lookups by name as well as by ID.
+    """
+    now = time.monotonic()
+    with _label_cache_lock:
+        service_id, name = _resolve_service_id(service, now)
+        entry = _not_autoscalable.get(service_id)
+        if entry is None:
+            return False
+        expires, service_name = entry
+        if expires < now:
+            del _not_autoscalable[service_id]
+            return False
+        if name is not None and name != service_name:
+            del _service_ids[name]
+            return False
+        return True
+
+
+def _load_labels(service):
+    """
+    Returns the labels, the autoscaling settings and the inspect data of a service.
+
+    The inspect data is None when the labels were served from the cache.
+    Otherwise the service is inspected and its labels are cached.
+    """
+    if isinstance(service, str):
+        cached = _cached_labels(service)
+        if cached is not None:
+            return cached + (None,)
+
+    epoch = _label_cache_epoch
+    attrs = _get_service_attrs(service)
+    return _cache_labels(attrs, epoch) + (attrs,)
+
+
+def invalidate_service_labels(*services):
+    """
+    Drops the cached labels and autoscaling results for the given service names or IDs.
+    """
+    global _label_cache_epoch  # pylint: disable=global-statement
+    with _label_cache_lock:
+        _label_cache_epoch += 1
+        for service in services:
+            service_id, _ = _service_ids.get(service, (service, None))
+            _label_cache.pop(service_id, None)
+            _not_autoscalable.pop(service_id, None)
+
+
+def _handle_service_event(event):
+    """
+    Drops the cached data of the service a Docker service event is about.
+    """
+    actor = event.get('Actor') or {}
+    service_id = actor.get('ID')
+    if not service_id:
+        return
+    invalidate_service_labels(service_id)
+    if event.get('Action') == 'remove':
+        name = (actor.get('Attributes') or {}).get('name')
+        with _label_cache_lock:
+            if _service_ids.get(name, (None, None))[0] == service_id:
+                del _service_ids[name]
+
+
+def _set_events_connected(connected):
+    """
+    Marks the service event stream as connected or disconnected and drops the cached labels.
+
+    Events may have been missed while disconnected, and labels cached for
+    EVENT_CACHE_TTL seconds are no longer dropped by events once the stream
+    is lost, so the cache starts over either way.
+    """
+    global _label_cache_epoch  # pylint: disable=global-statement
+    with _label_cache_lock:
+        _label_cache_epoch += 1
+        _label_cache.clear()
+        _not_autoscalable.clear()
+        if connected:
+            _events_connected.set()
+        else:
+            _events_connected.clear()
+
+
+def _watch_service_events():
+    """
+    Follows the Docker service event stream, reconnecting whenever it ends or fails.
+
+    The caches are only reset when a connected stream is lost, so a daemon
+    or proxy that never serves events leaves the LABEL_CACHE_TTL caching in place.
+    """
+    delay = EVENT_RETRY_DELAY
+    while True:
+        connected_at = None
+        error = None
+        try:
+            events = get_client().events(decode=True, filters={'type': 'service'})
+            try:
+                # Start from a fresh cache and warm it with the autoscalable services
+                connected_at = time.monotonic()
+                _set_events_connected(True)
+                list_autoscalable_services()
+                for event in events:
+                    _handle_service_event(event)
+            finally:
+                events.close()
+        except Exception as ex:  # pylint: disable=broad-except
+            # Keep the thread alive whatever the stream or the daemon fails with
+            error = ex
+        finally:
+            if connected_at is not None:
+                _set_events_connected(False)
+
+        # Start over from the shortest delay once a stream stayed up for longer than it
+        if connected_at is not None and time.monotonic() - connected_at >= delay:
+            delay = EVENT_RETRY_DELAY
+        if error is not None:
+            logger.error("Error: Docker event stream failed - %s, retrying in %g seconds",
+                         error, delay)
+        time.sleep(delay)
+        delay = min(delay * 2, EVENT_RETRY_MAX_DELAY)
+
+
+def start_event_listener():
+    """
+    Starts watching Docker service events in a background thread.
+
+    Cached labels are dropped as soon as a service is created, updated or
+    removed, so they can be kept for EVENT_CACHE_TTL seconds instead of
+    being refreshed every LABEL_CACHE_TTL seconds. Calling it again while the
+    listener runs has no effect, and starts it again if its thread has died.
+    """
+    global _event_thread  # pylint: disable=global-statement
+    with _client_lock:
+        if _event_thread is None or not _event_thread.is_alive():
+            _event_thread = threading.Thread(target=_watch_service_events,
+                                             name='docker-service-events', daemon=True)
+            _event_thread.start()
 
-# Create a Docker client object using the local environment
-docker_socket = os.getenv('DOCKERSOCKET', 'unix://var/run/docker.sock')
-client_kwargs = {'base_url': docker_socket} if docker_socket else {}
-client = docker.from_env(**client_kwargs)
 
 def get_service_labels(service):
     """
     Retrieves the labels for a Docker service.
 
+    Labels are cached by service ID for LABEL_CACHE_TTL seconds, or until a
+    service event drops them once start_event_listener() is running. Lookups
+    by name and by ID share an entry and a renamed service keeps its entry.
+    A name is checked against the cached entry, so it is not served the
+    labels of a service that has been renamed.
+    Service objects are always read directly and refresh the cache.
+
     Args:
-        service (str): The name or ID of the Docker service.
+        service (str or docker.models.services.Service): The name or ID of the
+            Docker service, or an already-fetched service object.
 
     Returns:
         dict: A dictionary containing the labels for the service.
@@ -64,76 +709,185 @@ def get_service_labels(service):
         raise ValueError("Service name not provided")
 
     try:
-        # Get the service object using the Docker client
-        service = client.services.get(service)
-        # Extract the labels from the service object
-        return service.attrs['Spec']['Labels']
+        return _load_labels(service)[0]
     except docker.errors.NotFound as ex:
         logger.error("Service not found (E001): %s", ex)
         raise
 
 
+def get_service_replicas(service):
+    """
+    Retrieves the current number of replicas of a Docker service.
+
+    The replica count is never cached, since it changes with every scale.
+
+    Args:
+        service (str or docker.models.services.Service): The name or ID of the
+            Docker service, or an already-fetched service object.
+
+    Returns:
+        int: The number of replicas the service is set to.
+
+    Raises:
+        docker.errors.NotFound: If the service with the specified name or ID is not found.
+    """
+    return _get_service_attrs(service)['Spec']['Mode']['Replicated']['Replicas']
+
+
+def _list_autoscalable_service_attrs():
+    """
+    Lists the Docker services that have the "swarm.autoscaler" label set to "true".
+
+    The label filter is applied by the Docker daemon, so all autoscalable
+    services are returned by a single request.
+
+    Returns:
+        list: The services as returned by the Docker API.
+    """
+    docker_socket = get_docker_socket()
+    if docker_socket is not None:
+        return docker_socket.list_services({'label': [_LBL_ON + '=true']})
+    return get_client().api.services(filters={'label': _LBL_ON + '=true'})
+
+
+def list_autoscalable_services():
+    """
+    Lists the Docker services that have autoscaling enabled.
+
+    Returns:
+        list: A (name, labels, replicas) tuple for every replicated service that
+        has the "swarm.autoscaler" label set to "true".
+    """
+    services = []
+    epoch = _label_cache_epoch
+    for attrs in _list_autoscalable_service_attrs():
+        labels, _ = _cache_labels(attrs, epoch)
+        spec = attrs['Spec']
+        if 'Replicated' not in spec['Mode']:
+            continue
+        services.append((spec['Name'], labels, spec['Mode']['Replicated']['Replicas']))
+    return services
+
+
+def _autoscale_allowed(autoscale, current_replicas):
+    """
+    Applies the autoscaling policy to parsed autoscaling settings and a replica count.
+    """
+    if not autoscale.enabled:
+        return False
+    if autoscale.max_replicas is None or current_replicas < autoscale.max_replicas:
+        return True
+    logger.error("Error: Autoscaling up is not allowed. Maximum replicas: %d",
+                 autoscale.max_replicas)
+    return False
+
+
+def _allowed_replicas(autoscale, current_replicas, replicas):
+    """
+    Applies the autoscaling policy to a requested replica count.
+
+    Scaling down is always allowed. Scaling up is capped at the maximum
+    allowed replicas, and refused once the service is already at it.
+
+    Returns:
+        int: The number of replicas to scale the service to, or None if it may not be scaled.
+    """
+    if not autoscale.enabled:
+        return None
+    if replicas <= current_replicas or autoscale.max_replicas is None:
+        return replicas
+    if current_replicas >= autoscale.max_replicas:
+        logger.error("Error: Autoscaling up is not allowed. Maximum replicas: %d",
+                     autoscale.max_replicas)
+        return None
+    return min(replicas, autoscale.max_replicas)
+
+
 def can_autoscale(service):
-     """
-     Checks if a Docker service is allowed to be autoscaled.
-     Autoscaling is allowed only if:
+    """
+    Checks if a Docker service is allowed to be autoscaled.
+    Autoscaling is allowed only if:
        - The service has the "swarm.autoscaler" label set to "true".
        - The integer value of the "swarm.autoscaler.maximum" label (if it exists)
          is greater than the current number of replicas.
     Args:
-        service (str): The name or ID of the Docker service.
+        service (str or docker.models.services.Service): The name or ID of the
+            Docker service, or an already-fetched service object.
     Returns:
-        bool: True if autoscaling is allowed for the service, False otherwise.
+        bool: True if autoscaling is allowed for the service, False otherwise,
+            including when the maximum allowed replicas is not an integer.
     Raises:
         ValueError: If the service name is not provided.
         docker.errors.NotFound: If the service with the specified name or ID is not found.
-        ValueError: If the maximum allowed replicas is not an integer.
     """
     if not service:
         raise ValueError("Service name not provided")
+    # Most services are not autoscalable, so that result is remembered for longer
+    if isinstance(service, str) and _known_not_autoscalable(service):
+        return False
     try:
-        # Get the labels for the service
-        labels = get_service_labels(service)
-
-        # Check if the service has the "swarm.autoscaler" label set to "true"
-        if labels.get('swarm.autoscaler') == 'true':
-            # Check if the maximum allowed replicas label is set
-            max_replicas = labels.get('swarm.autoscaler.maximum')
-            if not max_replicas:
-                return True
-
-            # Check if the maximum allowed replicas is an integer
-            try:
-                max_replicas = int(max_replicas)
-            except ValueError:
-                raise ValueError("Invalid value for maximum allowed replicas")
-
-            # Get the current number of replicas for the service
-            service_obj = client.services.get(service)
-            current_replicas = service_obj.attrs['Spec']['Mode']['Replicated']['Replicas']
-
-            # Check if autoscaling up is allowed
-            if current_replicas < max_replicas:
-                return True
-            else:
-                logger.error(f"Error: Autoscaling up is not allowed. Maximum replicas: {max_replicas}")
-                return False
-        else:
-            return False
+        # Use the cached labels if possible, otherwise fetch the service once
+        # and read both labels and replicas from it
+        _, autoscale, attrs = _load_labels(service)
+        # Only look up the replicas if there is a maximum to compare them to
+        if not autoscale.enabled or autoscale.max_replicas is None:
+            return autoscale.enabled
+        return _autoscale_allowed(autoscale, get_service_replicas(attrs or service))
     except docker.errors.NotFound as error:
-        logger.error(f"Error: Service not found - {error}")
-        raise
-    except ValueError as error:
-        logger.error(f"Error: {error}")
+        logger.error("Error: Service not found - %s", error)
         raise
 
 
-def scale_service(service, replicas):
+def _update_replicas(attrs, replicas):
     """
-    Scales a Docker service to the specified number of replicas.
+    Updates a Docker service to the specified number of replicas, without any policy checks.
+
+    The update is built from the given inspect data and uses its version, so
+    the current spec is not fetched again. Labels are passed through as they
+    are: the service labels stay in the spec annotations and the container
+    labels in the task template are left untouched.
+
     Args:
-        service (str): The name or ID of the Docker service.
+        attrs (dict): The inspect data of the service, as returned by the Docker API.
         replicas (int): The number of replicas to scale the service to.
+    """
+    spec = attrs['Spec']
+    if 'Replicated' not in spec['Mode']:
+        raise docker.errors.InvalidArgument('Cannot scale a global container')
+
+    # Send back the spec we already have with only the replicas changed, so the
+    # daemon sees no other difference and does not start a rolling update
+    mode = {'Replicated': {'Replicas': replicas}}
+    docker_socket = get_docker_socket()
+    if docker_socket is not None:
+        docker_socket.update_service(attrs['ID'], attrs['Version']['Index'], dict(spec, Mode=mode))
+    else:
+        get_client().api.update_service(
+            attrs['ID'], attrs['Version']['Index'],
+            task_template=spec['TaskTemplate'],
+            name=spec['Name'],
+            labels=spec.get('Labels'),
+            mode=mode,
+            update_config=spec.get('UpdateConfig'),
+            rollback_config=spec.get('RollbackConfig'),
+            endpoint_spec=spec.get('EndpointSpec'),
+            fetch_current_spec=False,
+        )
+    # The update creates a new version of the spec, so drop the cached labels
+    invalidate_service_labels(attrs['ID'])
+    # Log a message indicating that the service was scaled
+    logger.info("I002: Scaled %s to %d replicas", spec['Name'], replicas)
+
+
+def scale_service(service, replicas, labels=None):
+    """
+    Scales a Docker service to the specified number of replicas.
+    Args:
+        service (str or docker.models.services.Service): The name or ID of the
+            Docker service, or an already-fetched service object.
+        replicas (int): The number of replicas to scale the service to. Scaling up
+            is capped at the "swarm.autoscaler.maximum" label, if it is set.
+        labels (dict): The labels of the service, if the caller has already read them.
     Raises:
         I001: If the service name or number of replicas is not provided.
         E002: If the service with the specified name or ID is not found.
@@ -146,17 +900,17 @@ def scale_service(service, replicas):
         logger.error("I001: Number of replicas not provided")
         raise ValueError("Number of replicas not provided")
     try:
-        # Check if autoscaling is allowed for the service
-        if can_autoscale(service):
-            # Get the service object using the Docker client
-            service_obj = client.services.get(service)
-            # Update the service to the specified number of replicas
-            service_obj.update(mode=service_obj.mode.with_replicas(replicas))
-            # Log a message indicating that the service was scaled
-            logger.info("I002: Scaled %s to %d replicas", service_obj.name, replicas)
+        # Inspect the service once and reuse the data for the check and the update
+        attrs = _get_service_attrs(service)
+        # Check if autoscaling to the requested replicas is allowed for the service
+        autoscale = parse_spec(labels) if labels is not None else _load_labels(attrs)[1]
+        target = _allowed_replicas(autoscale, get_service_replicas(attrs), replicas)
+        if target is not None:
+            # Update the service to the allowed number of replicas
+            _update_replicas(attrs, target)
         else:
             # Log a message indicating that autoscaling is not allowed for the service
-            logger.warning("I003: Autoscaling not allowed for %s", service)
+            logger.warning("I003: Autoscaling not allowed for %s", attrs['Spec']['Name'])
     except docker.errors.NotFound as ex:
         logger.error("E002: Service not found - %s", ex)
         raise
@@ -170,6 +924,8 @@ def scale_service(service, replicas):
 def scale_service_linear(service, action):
     """
     Scales a Docker service by one replica in the specified direction.
+    The service is inspected once and the same data is used for the
+    autoscaling check and the update.
     Args:
         service (str): The name or ID of the Docker service.
         action (str): The scaling action to perform ("up" or "down").
@@ -183,9 +939,10 @@ def scale_service_linear(service, action):
     if not action:
         raise ValueError("Scaling action not provided")
     try:
-        # Get the current number of replicas for the service
-        service_obj = client.services.get(service)
-        current_replicas = service_obj.attrs['Spec']['Mode']['Replicated']['Replicas']
+        # Get the labels and current number of replicas for the service
+        attrs = _get_service_attrs(service)
+        spec = attrs['Spec']
+        current_replicas = spec['Mode']['Replicated']['Replicas']
 
         # Calculate the new number of replicas based on the scaling action
         if action == "up":
@@ -196,7 +953,7 @@ def scale_service_linear(service, action):
             raise ValueError("Invalid scaling action")
 
         # Scale the service to the new number of replicas
-        scale_service(service, new_replicas)
+        scale_service(attrs, new_replicas, labels=spec['Labels'])
     except docker.errors.NotFound as ex:
         logger.error("Error: Service not found - %s", ex)
         raise
@@ -206,3 +963,61 @@ def scale_service_linear(service, action):
     except ValueError as ex:
         logger.error("Error: Invalid input - %s", ex)
         raise
+
+
+def tick(replicas_by_service):
+    """
+    Runs one autoscaling pass over all autoscalable Docker services.
+
+    A single listing provides the labels and current replicas of every
+    service, the scaling decision is made from that data, and only services
+    whose replica count changes are updated, addressed by service ID. The
+    updates run concurrently on a shared pool of DOCKER_MAX_POOL_SIZE threads,
+    each of which keeps its connection to the Docker socket between ticks.
+    The IDs and labels of the listed services are cached, so later lookups
+    by name go straight to the service ID.
+    Args:
+        replicas_by_service (dict): A mapping of service names to the number of
+            replicas to scale each service to. Scaling up is capped at each
+            service's "swarm.autoscaler.maximum" label; scaling down is always allowed.
+            Global services are skipped.
+    Raises:
+        docker.errors.APIError: If there is an error listing or updating the services.
+    """
+    pending = dict(replicas_by_service)
+    decisions = []
+    epoch = _label_cache_epoch
+    for attrs in _list_autoscalable_service_attrs():
+        # Remember the ID and labels of every listed service for later lookups by name
+        _, autoscale = _cache_labels(attrs, epoch)
+        spec = attrs['Spec']
+        replicas = pending.pop(spec['Name'], None)
+        if not replicas:
+            continue
+        if 'Replicated' not in spec['Mode']:
+            # Global services run one task per node and cannot be scaled
+            logger.warning("I003: Autoscaling not allowed for %s", spec['Name'])
+            continue
+        current_replicas = spec['Mode']['Replicated']['Replicas']
+        if replicas == current_replicas:
+            continue
+        target = _allowed_replicas(autoscale, current_replicas, replicas)
+        if target is not None:
+            decisions.append((attrs, target))
+        elif not autoscale.enabled:
+            logger.warning("I003: Autoscaling not allowed for %s", spec['Name'])
+    for service in pending:
+        logger.warning("I003: Autoscaling not allowed for %s", service)
+    if not decisions:
+        return
+
+    # Overlap the update round-trips and re-raise the first failure once all are done
+    executor = _get_update_executor()
+    futures = [executor.submit(_update_replicas, attrs, replicas)
+               for attrs, replicas in decisions]
+    wait(futures)
+    errors = [future.exception() for future in futures if future.exception()]
+    for ex in errors:
+        logger.error("E003: Failed to update service - %s", ex)
+    if errors:
+        raise errors[0]
@@ -0,0 +1,647 @@
+"""
+Checks the Docker socket client, the event listener and the autoscaler against a fake Docker daemon.
+
+The fake daemon serves the few Docker Engine API endpoints the autoscaler
+uses over a Unix socket in a temporary directory, so no Docker daemon is
+needed. Run with: python -m unittest test_main
+"""
+
+import http.client
+import json
+import os
+import queue
+import re
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+import urllib.parse
+from http.server import BaseHTTPRequestHandler
+from unittest import mock
+
+import docker
+
+import main
+
+
+def make_service(index, replicas=2):
+    """
+    Returns the inspect data of a fake service, every other one being autoscalable.
+    """
+    if index % 2 == 0:
+        labels = {'swarm.autoscaler': 'true', 'swarm.autoscaler.maximum': '10'}
+    else:
+        labels = {'other': 'x'}
+    return {
+        'ID': f'id{index:03d}' + 'x' * 20,
+        'Version': {'Index': 10 + index},
+        'Spec': {
+            'Name': f'svc{index}',
+            'Labels': labels,
+            'TaskTemplate': {'ContainerSpec': {'Image': 'nginx:1'}},
+            'Mode': {'Replicated': {'Replicas': replicas}},
+        },
+    }
+
+
+class FakeDaemonHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of one connection to a FakeDaemon.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def daemon(self):
+        """
+        The fake daemon the request was sent to.
+        """
+        return self.server.fake_daemon
+
+    def setup(self):
+        super().setup()
+        self.daemon.connections.append(self.connection)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def send(self, status, body, content_type='application/json'):
+        """
+        Sends a response with a body, keeping the connection open.
+        """
+        if content_type == 'application/json':
+            body = json.dumps(body)
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self, method):
+        """
+        Records the request and returns its path segments and query.
+        """
+        url = urllib.parse.urlparse(self.path)
+        parts = [urllib.parse.unquote(part) for part in url.path.strip('/').split('/')]
+        if parts[0].startswith('v1.'):
+            parts = parts[1:]
+        self.daemon.requests.append((method, '/'.join(parts)))
+        if self.daemon.next_response is not None:
+            status, content_type, body = self.daemon.next_response
+            self.daemon.next_response = None
+            self.send(status, body, content_type)
+            return None, None
+        return parts, urllib.parse.parse_qs(url.query)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Serves the version, service list and service inspect endpoints.
+        """
+        parts, query = self.route('GET')
+        if parts is None:
+            return
+        if parts == ['events']:
+            self.stream_events()
+        elif parts == ['version']:
+            self.send(200, {'ApiVersion': '1.43'})
+        elif parts == ['services']:
+            services = list(self.daemon.services.values())
+            filters = json.loads(query.get('filters', ['{}'])[0])
+            for label in filters.get('label', []):
+                key, value = label.split('=')
+                services = [s for s in services if s['Spec']['Labels'].get(key) == value]
+            self.send(200, services)
+        elif parts[0] == 'services' and len(parts) == 2 and self.daemon.find(parts[1]):
+            self.send(200, self.daemon.find(parts[1]))
+        else:
+            self.send(404, {'message': f'service {parts[-1]} not found'})
+
+    def stream_events(self):
+        """
+        Streams the queued events as chunks until a None is queued.
+
+        Events are sent as JSON, while strings are sent as they are.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        while True:
+            event = self.daemon.events.get()
+            if event is None:
+                self.wfile.write(b'0\r\n\r\n')
+                self.close_connection = True
+                return
+            data = (event if isinstance(event, str) else json.dumps(event)).encode() + b'\n'
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Serves the service update endpoint.
+        """
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.daemon.hang_up_on_update:
+            self.daemon.requests.append(('POST', self.path))
+            self.close_connection = True
+            return
+        parts, query = self.route('POST')
+        if parts is None:
+            return
+        attrs = self.daemon.find(parts[1])
+        if attrs is None:
+            self.send(404, {'message': f'service {parts[1]} not found'})
+        elif int(query['version'][0]) != attrs['Version']['Index']:
+            self.send(500, {'message': 'update out of sequence'})
+        else:
+            attrs['Spec'] = body
+            attrs['Version']['Index'] += 1
+            self.send(200, {'Warnings': None})
+
+
+class FakeDaemon:
+    """
+    A fake Docker daemon that serves the service endpoints over a Unix socket.
+
+    Args:
+        socket_path (str): The path to listen on.
+        count (int): The number of services to create.
+    """
+
+    def __init__(self, socket_path, count=6):
+        self.services = {attrs['ID']: attrs for attrs in map(make_service, range(count))}
+        self.requests = []
+        self.connections = []
+        # A (status, content type, body) response to send to the next request instead
+        self.next_response = None
+        # The events to stream to the next /events request, None ends the stream
+        self.events = queue.Queue()
+        # Close the connection after reading an update instead of responding
+        self.hang_up_on_update = False
+        self.server = socketserver.ThreadingUnixStreamServer(socket_path, FakeDaemonHandler)
+        self.server.daemon_threads = True
+        self.server.fake_daemon = self
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        """
+        Stops the server and closes all connections.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self.events.put(None)
+        self.drop_connections()
+
+    def drop_connections(self):
+        """
+        Closes every open connection from the daemon side, like an idle timeout would.
+        """
+        connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def find(self, service):
+        """
+        Returns the service with the given ID or name, or None.
+        """
+        if service in self.services:
+            return self.services[service]
+        for attrs in self.services.values():
+            if attrs['Spec']['Name'] == service:
+                return attrs
+        return None
+
+
+class LabelParsingTest(unittest.TestCase):
+    """
+    Checks the parsing of the autoscaler labels.
+    """
+
+    def test_parse_small_uint(self):
+        """
+        Only plain ASCII digits are accepted, unlike int().
+        """
+        for value, expected in [('0', 0), ('7', 7), ('10', 10), ('0012', 12)]:
+            self.assertEqual(main._parse_small_uint(value), expected)  # pylint: disable=protected-access
+        for value in ['-1', '+1', '1_0', ' 5', '5 ', '5\n', '1.5', '\u00b2', '\u0665', 'ten']:
+            self.assertIsNone(main._parse_small_uint(value), value)  # pylint: disable=protected-access
+
+    def test_parse_spec(self):
+        """
+        Autoscaling needs the label set to "true" and a valid maximum, if there is one.
+        """
+        self.assertEqual(main.parse_spec({}), main.AutoscaleSpec(False, None))
+        self.assertEqual(main.parse_spec({'swarm.autoscaler': 'True'}),
+                         main.AutoscaleSpec(False, None))
+        self.assertEqual(main.parse_spec({'swarm.autoscaler': 'true'}),
+                         main.AutoscaleSpec(True, None))
+        self.assertEqual(main.parse_spec({'swarm.autoscaler': 'true',
+                                          'swarm.autoscaler.maximum': ''}),
+                         main.AutoscaleSpec(True, None))
+        self.assertEqual(main.parse_spec({'swarm.autoscaler': 'true',
+                                          'swarm.autoscaler.maximum': '10'}),
+                         main.AutoscaleSpec(True, 10))
+
+    def test_parse_spec_invalid_maximum(self):
+        """
+        An invalid maximum is logged and disables autoscaling.
+        """
+        for value in ['-1', '1_0', ' 5', '\u00b2']:
+            with self.assertLogs(main.logger, 'ERROR'):
+                spec = main.parse_spec({'swarm.autoscaler': 'true',
+                                        'swarm.autoscaler.maximum': value})
+            self.assertEqual(spec, main.AutoscaleSpec(False, None), value)
+
+
+class DaemonTestCase(unittest.TestCase):
+    """
+    Runs each test against a fresh fake daemon, with the module caches cleared.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.socket_path = os.path.join(directory.name, 'docker.sock')
+        self.daemon = FakeDaemon(self.socket_path)
+        self.addCleanup(self.daemon.close)
+        self.client = main.DockerSocket(self.socket_path, timeout=5)
+        self.addCleanup(self.client.close)
+
+        patcher = mock.patch.multiple(main, _docker_socket=self.client,
+                                      _docker_socket_resolved=True, _label_cache={},
+                                      _not_autoscalable={}, _service_ids={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class DockerSocketTest(DaemonTestCase):
+    """
+    Checks the DockerSocket client.
+    """
+
+    def test_list_services(self):
+        """
+        The label filter is sent to the daemon.
+        """
+        services = self.client.list_services({'label': ['swarm.autoscaler=true']})
+        self.assertEqual([s['Spec']['Name'] for s in services], ['svc0', 'svc2', 'svc4'])
+
+    def test_inspect_service(self):
+        """
+        Services are inspected by name or ID.
+        """
+        attrs = self.client.inspect_service('svc1')
+        self.assertEqual(self.client.inspect_service(attrs['ID']), attrs)
+
+    def test_update_service(self):
+        """
+        The spec is replaced at the given version.
+        """
+        attrs = self.client.inspect_service('svc0')
+        spec = dict(attrs['Spec'], Mode={'Replicated': {'Replicas': 5}})
+        self.client.update_service(attrs['ID'], attrs['Version']['Index'], spec)
+        self.assertEqual(self.daemon.find('svc0')['Spec'], spec)
+        with self.assertRaises(docker.errors.APIError):
+            self.client.update_service(attrs['ID'], attrs['Version']['Index'], spec)
+
+    def test_not_found(self):
+        """
+        A 404 raises NotFound with the message of the daemon.
+        """
+        with self.assertRaises(docker.errors.NotFound) as context:
+            self.client.inspect_service('missing')
+        self.assertEqual(context.exception.explanation, 'service missing not found')
+
+    def test_non_json_error(self):
+        """
+        An error with a plain text body raises APIError with the text.
+        """
+        self.daemon.next_response = (403, 'text/plain', 'forbidden by proxy')
+        with self.assertRaises(docker.errors.APIError) as context:
+            self.client.list_services()
+        self.assertEqual(context.exception.explanation, 'forbidden by proxy')
+        self.assertEqual(context.exception.status_code, 403)
+
+    def test_keep_alive(self):
+        """
+        Requests from the same thread share one connection until the client is closed.
+        """
+        for _ in range(3):
+            self.client.list_services()
+        self.assertEqual(len(self.daemon.connections), 1)
+        self.client.close()
+        self.client.list_services()
+        self.assertEqual(len(self.daemon.connections), 2)
+
+    def test_reconnect(self):
+        """
+        A connection closed by the daemon is replaced for both reads and updates.
+        """
+        attrs = self.client.inspect_service('svc0')
+        self.daemon.drop_connections()
+        self.assertEqual(self.client.inspect_service('svc0'), attrs)
+        self.daemon.drop_connections()
+        spec = dict(attrs['Spec'], Mode={'Replicated': {'Replicas': 3}})
+        self.client.update_service(attrs['ID'], attrs['Version']['Index'], spec)
+        self.assertEqual(self.daemon.find('svc0')['Spec'], spec)
+
+    def test_update_not_resent(self):
+        """
+        An update that reached the daemon is not sent again when the response is lost.
+        """
+        attrs = self.client.inspect_service('svc0')
+        self.daemon.hang_up_on_update = True
+        with self.assertRaises(http.client.HTTPException):
+            self.client.update_service(attrs['ID'], attrs['Version']['Index'], attrs['Spec'])
+        self.assertEqual([r[0] for r in self.daemon.requests].count('POST'), 1)
+
+
+class AutoscalerTest(DaemonTestCase):
+    """
+    Checks the autoscaler functions through the DockerSocket client.
+    """
+
+    def test_list_autoscalable_services(self):
+        """
+        Autoscalable services are listed with a single request.
+        """
+        services = main.list_autoscalable_services()
+        self.assertEqual([name for name, _, _ in services], ['svc0', 'svc2', 'svc4'])
+        self.assertEqual(self.daemon.requests, [('GET', 'services')])
+
+    def test_can_autoscale(self):
+        """
+        Labels are read once and then served from the cache, replicas are always read.
+        """
+        self.assertTrue(main.can_autoscale('svc0'))
+        self.assertFalse(main.can_autoscale('svc1'))
+        self.assertTrue(main.can_autoscale('svc0'))
+        self.assertFalse(main.can_autoscale('svc1'))
+        service_id = self.daemon.find('svc0')['ID']
+        self.assertEqual(self.daemon.requests, [('GET', 'services/svc0'), ('GET', 'services/svc1'),
+                                                ('GET', 'services/' + service_id)])
+        with self.assertRaises(docker.errors.NotFound):
+            main.can_autoscale('missing')
+
+    def test_not_autoscalable_by_name(self):
+        """
+        A service that is not autoscalable is not inspected again by name after the label TTL.
+        """
+        self.assertFalse(main.can_autoscale('svc1'))
+        now = time.monotonic()
+        with mock.patch('time.monotonic', return_value=now + main.LABEL_CACHE_TTL + 1):
+            self.assertFalse(main.can_autoscale('svc1'))
+        self.assertEqual(self.daemon.requests, [('GET', 'services/svc1')])
+        with mock.patch('time.monotonic', return_value=now + main.NOT_AUTOSCALABLE_CACHE_TTL + 1):
+            self.assertFalse(main.can_autoscale('svc1'))
+        self.assertEqual(self.daemon.requests, [('GET', 'services/svc1')] * 2)
+
+    def test_not_autoscalable_removed(self):
+        """
+        A service created again under the name of a removed one is inspected again.
+        """
+        self.assertFalse(main.can_autoscale('svc1'))
+        attrs = self.daemon.services.pop(self.daemon.find('svc1')['ID'])
+        main._handle_service_event({  # pylint: disable=protected-access
+            'Type': 'service', 'Action': 'remove',
+            'Actor': {'ID': attrs['ID'], 'Attributes': {'name': 'svc1'}}})
+        recreated = dict(make_service(1), ID='new' + attrs['ID'][3:])
+        recreated['Spec']['Labels'] = {'swarm.autoscaler': 'true'}
+        self.daemon.services[recreated['ID']] = recreated
+        self.assertTrue(main.can_autoscale('svc1'))
+
+    def test_event_during_lookup(self):
+        """
+        Labels read before an update event is handled are not cached.
+        """
+        attrs = self.daemon.find('svc0')
+        inspect_service = main._inspect_service  # pylint: disable=protected-access
+
+        def inspect_then_update(service):
+            result = inspect_service(service)
+            attrs['Spec']['Labels'] = {'swarm.autoscaler': 'false'}
+            main._handle_service_event({  # pylint: disable=protected-access
+                'Type': 'service', 'Action': 'update',
+                'Actor': {'ID': attrs['ID'], 'Attributes': {'name': 'svc0'}}})
+            return result
+
+        with mock.patch.object(main, '_inspect_service', inspect_then_update):
+            self.assertEqual(main.get_service_labels('svc0')['swarm.autoscaler'], 'true')
+        self.assertNotIn(attrs['ID'], main._label_cache)  # pylint: disable=protected-access
+        self.assertEqual(main.get_service_labels('svc0'), {'swarm.autoscaler': 'false'})
+
+    def test_scale_service(self):
+        """
+        Scaling up is capped at the maximum and only changes the replicas.
+        """
+        spec = self.daemon.find('svc0')['Spec']
+        main.scale_service('svc0', 20)
+        self.assertEqual(self.daemon.find('svc0')['Spec'],
+                         dict(spec, Mode={'Replicated': {'Replicas': 10}}))
+        main.scale_service('svc1', 3)
+        self.assertEqual(self.daemon.find('svc1')['Spec']['Mode']['Replicated']['Replicas'], 2)
+
+    def test_tick(self):
+        """
+        Only the services whose replicas change are updated.
+        """
+        main.tick({'svc0': 4, 'svc1': 4, 'svc2': 2, 'missing': 1})
+        replicas = {a['Spec']['Name']: a['Spec']['Mode']['Replicated']['Replicas']
+                    for a in self.daemon.services.values()}
+        self.assertEqual(replicas, {'svc0': 4, 'svc1': 2, 'svc2': 2, 'svc3': 2,
+                                    'svc4': 2, 'svc5': 2})
+        self.assertEqual([r for r in self.daemon.requests if r[0] == 'POST'],
+                         [('POST', 'services/' + self.daemon.find('svc0')['ID'] + '/update')])
+
+    def test_tick_global_service(self):
+        """
+        Global services are skipped instead of failing the tick.
+        """
+        self.daemon.find('svc4')['Spec']['Mode'] = {'Global': {}}
+        main.tick({'svc0': 4, 'svc4': 3})
+        self.assertEqual(self.daemon.find('svc4')['Spec']['Mode'], {'Global': {}})
+        self.assertEqual(self.daemon.find('svc0')['Spec']['Mode']['Replicated']['Replicas'], 4)
+
+
+class DockerClientTest(DaemonTestCase):
+    """
+    Checks the autoscaler functions through the docker library client, as used for TCP hosts.
+    """
+
+    def setUp(self):
+        super().setUp()
+        docker_client = docker.DockerClient(base_url='unix://' + self.socket_path, version='1.43')
+        self.addCleanup(docker_client.close)
+        patcher = mock.patch.multiple(main, _docker_socket=None, _client=docker_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tick(self):
+        """
+        Updates send back the listed spec with only the replicas changed.
+        """
+        spec0 = self.daemon.find('svc0')['Spec']
+        spec2 = self.daemon.find('svc2')['Spec']
+        main.tick({'svc0': 4, 'svc2': 20, 'svc1': 3})
+        self.assertEqual(self.daemon.find('svc0')['Spec'],
+                         dict(spec0, Mode={'Replicated': {'Replicas': 4}}))
+        self.assertEqual(self.daemon.find('svc2')['Spec'],
+                         dict(spec2, Mode={'Replicated': {'Replicas': 10}}))
+        self.assertEqual(self.daemon.find('svc1')['Spec']['Mode']['Replicated']['Replicas'], 2)
+        self.assertEqual([r for r in self.daemon.requests if r[0] != 'POST'],
+                         [('GET', 'services')])
+
+    def test_scale_service(self):
+        """
+        A service is inspected by name once and updated at its version.
+        """
+        attrs = self.daemon.find('svc4')
+        spec, version = attrs['Spec'], attrs['Version']['Index']
+        main.scale_service('svc4', 3)
+        self.assertEqual(attrs['Spec'], dict(spec, Mode={'Replicated': {'Replicas': 3}}))
+        self.assertEqual(attrs['Version']['Index'], version + 1)
+        self.assertEqual(self.daemon.requests, [('GET', 'services/svc4'),
+                                                ('POST', f"services/{attrs['ID']}/update")])
+
+
+class EventListenerTest(DaemonTestCase):
+    """
+    Checks the service event listener, with the docker library client for the event stream.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.docker_client = docker.DockerClient(base_url='unix://' + self.socket_path,
+                                                 version='1.43')
+        self.addCleanup(self.docker_client.close)
+        self.stopped = False
+
+        def get_client():
+            # SystemExit is not caught by the listener, so it ends the thread
+            if self.stopped:
+                raise SystemExit
+            return self.docker_client
+
+        patcher = mock.patch.multiple(main, get_client=get_client, EVENT_RETRY_DELAY=0.01,
+                                      EVENT_RETRY_MAX_DELAY=0.05, _event_thread=None,
+                                      _events_connected=threading.Event())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.stop_listener)
+
+    def stop_listener(self):
+        """
+        Ends the event stream and waits for the listener thread to exit.
+        """
+        self.stopped = True
+        self.daemon.events.put(None)
+        if main._event_thread is not None:  # pylint: disable=protected-access
+            main._event_thread.join(5)  # pylint: disable=protected-access
+
+    def wait_for(self, condition):
+        """
+        Waits for a condition to become true, failing after a few seconds.
+        """
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, 'condition not met in time')
+            time.sleep(0.01)
+
+    def stream_count(self):
+        """
+        Returns how often the event stream was requested.
+        """
+        return self.daemon.requests.count(('GET', 'events'))
+
+    def start(self):
+        """
+        Starts the listener and waits until it has warmed the label cache.
+        """
+        main.start_event_listener()
+        self.wait_for(lambda: self.daemon.requests[-1:] == [('GET', 'services')])
+        self.wait_for(lambda: main._label_cache)  # pylint: disable=protected-access
+
+    def test_event_invalidates_labels(self):
+        """
+        An update event drops the cached labels, which are kept longer while connected.
+        """
+        self.start()
+        self.assertEqual(main._label_cache_ttl(), main.EVENT_CACHE_TTL)  # pylint: disable=protected-access
+        attrs = self.daemon.find('svc0')
+        self.assertEqual(main.get_service_labels('svc0'), attrs['Spec']['Labels'])
+        attrs['Spec']['Labels'] = {'swarm.autoscaler': 'false'}
+        self.daemon.events.put({'Type': 'service', 'Action': 'update',
+                                'Actor': {'ID': attrs['ID'], 'Attributes': {'name': 'svc0'}}})
+        self.wait_for(lambda: attrs['ID'] not in main._label_cache)  # pylint: disable=protected-access
+        self.assertEqual(main.get_service_labels('svc0'), {'swarm.autoscaler': 'false'})
+
+    def test_reconnect(self):
+        """
+        The listener reconnects when the stream ends, fails or cannot be opened.
+        """
+        self.start()
+        # The stream ends
+        self.daemon.events.put(None)
+        self.wait_for(lambda: self.stream_count() == 2)
+        # The stream ends with something that is not JSON
+        self.wait_for(main._events_connected.is_set)  # pylint: disable=protected-access
+        self.daemon.events.put('not json')
+        self.daemon.events.put(None)
+        self.wait_for(lambda: self.stream_count() == 3)
+        # The stream cannot be opened
+        self.wait_for(main._events_connected.is_set)  # pylint: disable=protected-access
+        self.daemon.next_response = (500, 'text/plain', 'daemon is restarting')
+        self.daemon.events.put(None)
+        self.wait_for(lambda: self.stream_count() == 5)
+        self.wait_for(main._events_connected.is_set)  # pylint: disable=protected-access
+        self.assertTrue(main._event_thread.is_alive())  # pylint: disable=protected-access
+
+    def test_disconnect_drops_cache(self):
+        """
+        Labels cached while connected are dropped once the stream is lost.
+        """
+        self.start()
+        self.stop_listener()
+        self.assertFalse(main._events_connected.is_set())  # pylint: disable=protected-access
+        self.assertEqual(main._label_cache, {})  # pylint: disable=protected-access
+        self.assertEqual(main._label_cache_ttl(), main.LABEL_CACHE_TTL)  # pylint: disable=protected-access
+
+    def test_events_unreachable(self):
+        """
+        A stream that cannot be opened is retried with backoff and leaves the cache alone.
+        """
+        self.assertFalse(main.can_autoscale('svc1'))
+        error = docker.errors.APIError('events blocked')
+        with mock.patch.object(self.docker_client, 'events', side_effect=error) as events, \
+                self.assertLogs(main.logger, 'ERROR') as logs:
+            main.start_event_listener()
+            self.wait_for(lambda: events.call_count >= 5)
+            self.stop_listener()
+        delays = [float(re.search(r'retrying in ([\d.]+) seconds', line).group(1))
+                  for line in logs.output]
+        self.assertEqual(delays[:5], [0.01, 0.02, 0.04, 0.05, 0.05])
+        self.assertIn(self.daemon.find('svc1')['ID'], main._not_autoscalable)  # pylint: disable=protected-access
+        self.assertEqual(self.daemon.requests, [('GET', 'services/svc1')])
+
+    def test_restart(self):
+        """
+        Starting the listener again replaces a thread that has exited.
+        """
+        self.start()
+        thread = main._event_thread  # pylint: disable=protected-access
+        main.start_event_listener()
+        self.assertIs(main._event_thread, thread)  # pylint: disable=protected-access
+        self.stop_listener()
+        self.assertFalse(thread.is_alive())
+        self.stopped = False
+        self.start()
+        self.assertIsNot(main._event_thread, thread)  # pylint: disable=protected-access
+        self.assertTrue(main._event_thread.is_alive())  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    unittest.main()